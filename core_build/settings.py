@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
+import sys
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -128,4 +129,14 @@ STATIC_URL = 'static/'
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 
-DOCUMENTS_DOCUMENTTYPES_PATH = 'initial_data/data/document_types.json'
\ No newline at end of file
+DOCUMENTS_DOCUMENTTYPES_PATH = 'initial_data/data/document_types.json'
+
+
+# Test runs
+# core_build only hosts the test app, so test runs swap in a cheap password
+# hasher; create_user() otherwise spends most of its time in PBKDF2
+
+TESTING = sys.argv[1:2] == ['test'] or 'pytest' in sys.modules
+
+if TESTING:
+    PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
@@ -1,12 +1,66 @@
+import re
+import uuid
+
+from functools import lru_cache
+
 from django.contrib import admin
+from django.contrib.admin.views.main import ChangeList
+from django.forms.models import BaseInlineFormSet
 from django.utils.html import format_html
-from django.urls import reverse
+from django.urls import get_script_prefix, reverse
+from django.utils import timezone
 from django.utils.safestring import mark_safe
-from django.db import models
+from django.utils.translation import get_language
+from django.db import models, transaction
+from django.db.models import BooleanField, Case, Prefetch, Value, When
+from django.db.models.functions import Now
 
 from .models import DocumentType, Document, DocumentVersion
 
 
+# Maximum number of primary keys sent in a single admin action UPDATE
+ACTION_UPDATE_CHUNK_SIZE = 1000
+
+
+def _update_in_chunks(queryset, **values):
+    """
+    Apply queryset.update(**values) in bounded pk__in chunks inside one
+    transaction, returning the total number of rows updated.
+    """
+    pks = list(queryset.prefetch_related(None).order_by().values_list('pk', flat=True))
+    updated = 0
+    with transaction.atomic():
+        for start in range(0, len(pks), ACTION_UPDATE_CHUNK_SIZE):
+            chunk = pks[start:start + ACTION_UPDATE_CHUNK_SIZE]
+            updated += queryset.model.objects.filter(pk__in=chunk).update(**values)
+    return updated
+
+
+_URL_PK_PLACEHOLDER = '__pk__'
+
+_SHA256_HEX_RE = re.compile(r'[0-9a-f]{64}')
+
+
+def _admin_change_url_template(url_name):
+    """
+    Resolve an admin change URL once and return it as a str.format template
+    taking the object pk, so changelist rows don't each call reverse().
+    """
+    # reverse() output depends on the request's script prefix and, under
+    # i18n_patterns, the active language, so both are part of the cache key
+    return _resolve_change_url_template(url_name, get_script_prefix(), get_language())
+
+
+@lru_cache(maxsize=128)
+def _resolve_change_url_template(url_name, script_prefix, language):
+    """
+    Cached body of _admin_change_url_template. script_prefix and language
+    only key the cache; reverse() reads the current ones itself.
+    """
+    url = reverse(url_name, args=[_URL_PK_PLACEHOLDER])
+    return url.replace(_URL_PK_PLACEHOLDER, '{}')
+
+
 @admin.register(DocumentType)
 class DocumentTypeAdmin(admin.ModelAdmin):
     list_display = ['name', 'code', 'max_file_size_mb', 'file_extensions_display', 'requires_validation', 'is_financial', 'is_selectable']
@@ -27,9 +81,23 @@ class DocumentTypeAdmin(admin.ModelAdmin):
     file_extensions_display.short_description = 'File Extensions'
 
 
+class DocumentVersionInlineFormSet(BaseInlineFormSet):
+    """
+    Inline formset that only loads the newest max_num versions of a document.
+    Older versions stay reachable through the inline change links.
+    """
+    def get_queryset(self):
+        if not hasattr(self, '_queryset'):
+            self._queryset = super().get_queryset()[:self.max_num]
+        return self._queryset
+
+
 class DocumentVersionInline(admin.TabularInline):
     model = DocumentVersion
+    formset = DocumentVersionInlineFormSet
     extra = 0
+    max_num = 20
+    show_change_link = True
     readonly_fields = ['version', 'file_size_bytes', 'file_hash', 'mime_type', 'is_current', 'date_created', 'file_size_display']
     fields = ['version', 'file', 'file_original_name', 'file_size_display', 'mime_type', 'is_current', 'document_date']
     ordering = ['-version']  # Show newest versions first
@@ -39,6 +107,24 @@ class DocumentVersionInline(admin.TabularInline):
     file_size_display.short_description = 'File Size'
 
 
+class DocumentChangeList(ChangeList):
+    """
+    Document changelist that skips loading the large text/JSON columns
+    none of the list_display columns render, and computes expiration in SQL.
+    """
+    deferred_fields = ('description', 'validation_notes', 'validation_errors', 'ai_extracted_data')
+
+    def get_queryset(self, request, *args, **kwargs):
+        queryset = super().get_queryset(request, *args, **kwargs).defer(*self.deferred_fields)
+        return queryset.annotate(
+            _is_expired=Case(
+                When(expiration_date__lt=timezone.now().date(), then=Value(True)),
+                default=Value(False),
+                output_field=BooleanField()
+            )
+        )
+
+
 @admin.register(Document)
 class DocumentAdmin(admin.ModelAdmin):
     list_display = [
@@ -50,7 +136,7 @@ class DocumentAdmin(admin.ModelAdmin):
         'is_confidential', ('expiration_date', admin.DateFieldListFilter), 
         ('date_created', admin.DateFieldListFilter)
     ]
-    search_fields = ['title', 'description', 'owner_uuid']
+    search_fields = ['title', 'description']
     readonly_fields = [
         'owner_uuid', 'owner_content_type', 'date_created', 'date_updated',
         'ai_extracted_data', 'ai_confidence_score'
@@ -58,6 +144,7 @@ class DocumentAdmin(admin.ModelAdmin):
     date_hierarchy = 'date_created'
     ordering = ['-date_created']
     list_per_page = 25
+    list_select_related = ('document_type', 'validated_by')
     actions = ['mark_as_validated', 'mark_as_pending']
     
     fieldsets = (
@@ -85,6 +172,36 @@ class DocumentAdmin(admin.ModelAdmin):
     )
     inlines = [DocumentVersionInline]
     
+    def get_queryset(self, request):
+        # Join the FK relations used by the display methods so each row
+        # doesn't trigger its own SELECT
+        queryset = super().get_queryset(request).select_related('document_type', 'validated_by')
+        # Load the current version of every row in a single extra query
+        return queryset.prefetch_related(
+            Prefetch(
+                'versions',
+                queryset=DocumentVersion.objects.filter(is_current=True),
+                to_attr='_current_versions'
+            )
+        )
+    
+    def get_search_results(self, request, queryset, search_term):
+        # A UUID-shaped term is an exact owner lookup, which can use the
+        # owner_uuid index instead of a LIKE scan on the column
+        try:
+            owner_uuid = uuid.UUID(search_term.strip())
+        except ValueError:
+            return super().get_search_results(request, queryset, search_term)
+        return queryset.filter(owner_uuid=owner_uuid), False
+    
+    def get_changelist(self, request, **kwargs):
+        return DocumentChangeList
+    
+    def get_changelist_instance(self, request):
+        changelist = super().get_changelist_instance(request)
+        Document.bulk_resolve_owners(changelist.result_list)
+        return changelist
+    
     def owner_display(self, obj: 'Document'):
         owner = obj.owner  # Use the new property
         if owner:
@@ -93,7 +210,10 @@ class DocumentAdmin(admin.ModelAdmin):
     owner_display.short_description = 'Owner'
     
     def current_version_display(self, obj):
-        current_version = obj.get_current_version()
+        if hasattr(obj, '_current_versions'):
+            current_version = obj._current_versions[0] if obj._current_versions else None
+        else:
+            current_version = obj.get_current_version()
         if current_version:
             return f"v{current_version.version}"
         return 'No versions'
@@ -102,24 +222,26 @@ class DocumentAdmin(admin.ModelAdmin):
     def expiration_status(self, obj):
         if not obj.expiration_date:
             return '-'
-        if obj.is_expired():
+        is_expired = obj._is_expired if hasattr(obj, '_is_expired') else obj.is_expired()
+        if is_expired:
             return format_html('<span style="color: red; font-weight: bold;">Expired</span>')
         else:
             return format_html('<span style="color: green;">Valid</span>')
     expiration_status.short_description = 'Status'
     
     def mark_as_validated(self, request, queryset):
-        from django.utils import timezone
-        updated = queryset.update(
+        updated = _update_in_chunks(
+            queryset,
             validation_status='validated',
             validated_by=request.user,
-            validation_date=timezone.now()
+            validation_date=Now()
         )
         self.message_user(request, f'{updated} documents marked as validated.')
     mark_as_validated.short_description = "Mark selected documents as validated"
     
     def mark_as_pending(self, request, queryset):
-        updated = queryset.update(
+        updated = _update_in_chunks(
+            queryset,
             validation_status='pending',
             validated_by=None,
             validation_date=None
@@ -139,7 +261,7 @@ class DocumentVersionAdmin(admin.ModelAdmin):
         ('document_date', admin.DateFieldListFilter), 
         ('date_created', admin.DateFieldListFilter)
     ]
-    search_fields = ['document__title', 'file_original_name', 'file_hash']
+    search_fields = ['^document__title', 'file_original_name']
     readonly_fields = [
         'version', 'file_size_bytes', 'file_hash', 'mime_type', 
         'date_created', 'date_updated'
@@ -147,10 +269,19 @@ class DocumentVersionAdmin(admin.ModelAdmin):
     date_hierarchy = 'date_created'
     ordering = ['-date_created']
     list_per_page = 50
+    list_select_related = ('document',)
+    
+    def get_search_results(self, request, queryset, search_term):
+        # A full SHA-256 hex digest is an exact file_hash lookup, which can use
+        # the file_hash index instead of a LIKE scan on the column
+        term = search_term.strip().lower()
+        if _SHA256_HEX_RE.fullmatch(term):
+            return queryset.filter(file_hash=term), False
+        return super().get_search_results(request, queryset, search_term)
     
     def document_link(self, obj):
-        if obj.document:
-            url = reverse('admin:django_document_manager_document_change', args=[obj.document.pk])
+        if obj.document_id:
+            url = _admin_change_url_template('admin:django_document_manager_document_change').format(obj.document_id)
             return format_html('<a href="{}">{}</a>', url, obj.document.title)
         return '-'
     document_link.short_description = 'Document'
@@ -8,4 +8,5 @@ class DjangoDocumentManagerConfig(AppConfig):
 
     def ready(self):
         import django_document_manager.catalogs
+        import django_document_manager.checks
         return super().ready()
@@ -0,0 +1,27 @@
+from pathlib import Path
+
+from django.core.checks import Error, register
+from django.core.exceptions import ImproperlyConfigured
+
+from .conf import documents_settings
+
+
+@register()
+def check_document_types_path(app_configs, **kwargs):
+    """
+    Check that the configured document types file exists. Runs with the
+    system checks (check, migrate, runserver, ...) instead of on import, so
+    commands like --help don't stat the file.
+    """
+    try:
+        path = documents_settings.DOCUMENTS_DOCUMENTTYPES_PATH
+    except ImproperlyConfigured as e:
+        return [Error(str(e), id='django_document_manager.E001')]
+
+    if not path.is_file():
+        return [Error(
+            f"DOCUMENTS_DOCUMENTTYPES_PATH file does not exist: {path}.",
+            hint=f"settings.BASE_DIR is used to resolve relative paths, but fallback to cwd: {Path.cwd()}",
+            id='django_document_manager.E002',
+        )]
+    return []
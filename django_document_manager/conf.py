@@ -1,5 +1,6 @@
 import logging
 
+from functools import cached_property
 from pathlib import Path
 
 from django_crud_audit.conf import _get_django_settings, _get_django_improperly_configured
@@ -11,19 +12,15 @@ logger = logging.getLogger(__name__)
 class Settings:
     """
     Settings for django_catalogs app
-    """
-
-    def __init__(self):
-        self._DOCUMENTS_DOCUMENTTYPES_PATH = self._get_document_types_path()
-        self.__post_init__()
 
-    def __post_init__(self):
-        if not self.DOCUMENTS_DOCUMENTTYPES_PATH.is_file():
-            raise _get_django_improperly_configured()(f"DOCUMENTS_DOCUMENTTYPES_PATH file does not exist: {self.DOCUMENTS_DOCUMENTTYPES_PATH}.\n\tHINT: settings.BASE_DIR is used to resolve relative paths, but fallback to cwd: {Path.cwd()}")
+    Values are resolved lazily on first access and cached on the instance,
+    so importing this module doesn't read Django settings or touch the
+    filesystem.
+    """
 
-    @property
+    @cached_property
     def DOCUMENTS_DOCUMENTTYPES_PATH(self) -> Path:
-        return self._DOCUMENTS_DOCUMENTTYPES_PATH
+        return self._get_document_types_path()
     
     def _get_document_types_path(self) -> Path:
         file_path = getattr(
@@ -44,4 +41,4 @@ class Settings:
 documents_settings = Settings()
 
 # Export the settings instance
-__all__ = ['documents_settings']
\ No newline at end of file
+__all__ = ['documents_settings']
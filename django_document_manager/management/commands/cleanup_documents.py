@@ -24,6 +24,12 @@ class Command(BaseCommand):
             default=30,
             help='Delete expired documents older than N days (default: 30)',
         )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of expired documents deleted per batch (default: 1000)',
+        )
         parser.add_argument(
             '--cleanup-temp',
             action='store_true',
@@ -33,8 +39,12 @@ class Command(BaseCommand):
     def handle(self, *args, **options):
         dry_run = options['dry_run']
         days = options['days']
+        batch_size = options['batch_size']
         cleanup_temp = options['cleanup_temp']
 
+        if batch_size < 1:
+            raise CommandError('--batch-size must be a positive integer')
+
         if dry_run:
             self.stdout.write(
                 self.style.WARNING('DRY RUN MODE - No files will be deleted')
@@ -46,20 +56,31 @@ class Command(BaseCommand):
             expiration_date__lt=cutoff_date,
         )
 
-        if expired_docs.exists():
+        if dry_run:
             count = expired_docs.count()
-            self.stdout.write(
-                f'Found {count} expired documents older than {days} days'
-            )
-            
-            if not dry_run:
-                # Soft delete expired documents
-                expired_docs.delete()
+            if count:
                 self.stdout.write(
-                    self.style.SUCCESS(f'Soft-deleted {count} expired documents')
+                    f'Found {count} expired documents older than {days} days'
                 )
+            else:
+                self.stdout.write('No expired documents found')
         else:
-            self.stdout.write('No expired documents found')
+            # Soft delete expired documents in bounded batches so neither the
+            # primary keys nor the row locks of the whole set are held at once
+            count = 0
+            while True:
+                pks = list(expired_docs.values_list('pk', flat=True)[:batch_size])
+                if not pks:
+                    break
+                Document.objects.filter(pk__in=pks).delete()
+                count += len(pks)
+
+            if count:
+                self.stdout.write(
+                    self.style.SUCCESS(f'Soft-deleted {count} expired documents older than {days} days')
+                )
+            else:
+                self.stdout.write('No expired documents found')
 
         # Clean up temp files if requested
         if cleanup_temp:
@@ -2,8 +2,10 @@
 Management command to handle circular dependency issues with django-document-manager
 """
 
+from collections import defaultdict
+
 from django.core.management.base import BaseCommand, CommandError
-from django.db import migrations
+from django.db.migrations.loader import MigrationLoader
 from django.apps import apps
 from django.conf import settings
 
@@ -62,7 +64,11 @@ class Command(BaseCommand):
         """
         Detect potential circular dependencies between apps
         """
+        from django_document_manager.models.models import get_document_owner_models
+
         circular_deps = []
+        deps_by_app = self.get_migration_dependencies_by_app()
+        owner_models = set(get_document_owner_models())
         
         try:
             # Get all apps that might have BaseDocumentOwnerModel subclasses
@@ -75,10 +81,9 @@ class Command(BaseCommand):
                     models = app_config.get_models()
                     for model in models:
                         # Check if model inherits from BaseDocumentOwnerModel
-                        from django_document_manager.models import BaseDocumentOwnerModel
-                        if issubclass(model, BaseDocumentOwnerModel) and model != BaseDocumentOwnerModel:
+                        if model in owner_models:
                             # Check if this app also has migrations that depend on auth
-                            migration_files = self.get_app_migration_dependencies(app_config.label)
+                            migration_files = deps_by_app[app_config.label]
                             if 'auth' in migration_files or settings.AUTH_USER_MODEL.split('.')[0] in migration_files:
                                 circular_deps.append(app_config.label)
                                 
@@ -91,18 +96,18 @@ class Command(BaseCommand):
             
         return circular_deps
 
-    def get_app_migration_dependencies(self, app_label):
+    def get_migration_dependencies_by_app(self):
         """
-        Get migration dependencies for an app
+        Map each app label to the apps its migrations depend on, building the
+        migration graph only once for all apps
         """
-        dependencies = set()
+        dependencies = defaultdict(set)
         try:
-            migration_loader = migrations.loader.MigrationLoader(connection=None)
-            for migration in migration_loader.graph.nodes:
-                if migration[0] == app_label:
-                    migration_obj = migration_loader.get_migration(*migration)
-                    for dep in migration_obj.dependencies:
-                        dependencies.add(dep[0])
+            migration_loader = MigrationLoader(connection=None)
+            for app_label, migration_name in migration_loader.graph.nodes:
+                migration_obj = migration_loader.get_migration(app_label, migration_name)
+                for dep in migration_obj.dependencies:
+                    dependencies[app_label].add(dep[0])
         except Exception:
             pass
         return dependencies
@@ -19,12 +19,14 @@ import time
 from typing import List, Type
 
 from django.core.management.base import BaseCommand, CommandError
-from django.db import transaction, connection
+from django.db import DatabaseError, connections, router, transaction
 from django.apps import apps
-from django.db.models import Model
+from django.db.models import Func, Model, UUIDField
 from django.conf import settings
 
-from django_document_manager.models.models import BaseDocumentOwnerModel
+from django_document_manager.models.models import (
+    BaseDocumentOwnerModel, _generate_uuid7, get_document_owner_models,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -119,14 +121,7 @@ class Command(BaseCommand):
         """
         Find all concrete models that inherit from BaseDocumentOwnerModel
         """
-        owner_models = []
-        
-        for model in apps.get_models():
-            if (issubclass(model, BaseDocumentOwnerModel) and 
-                not model._meta.abstract):
-                owner_models.append(model)
-        
-        return owner_models
+        return list(get_document_owner_models())
 
     def _update_model(self, model_class: Type[Model]):
         """
@@ -134,18 +129,20 @@ class Command(BaseCommand):
         """
         model_name = f"{model_class._meta.app_label}.{model_class._meta.model_name}"
         
-        # Get count of instances without UUIDs
+        # Instances without UUIDs
         instances_without_uuid = model_class.objects.filter(
             document_owner_uuid__isnull=True
         )
-        total_count = instances_without_uuid.count()
-        
-        if total_count == 0:
+        # EXISTS stops at the first match, so already backfilled tables (the
+        # usual case) skip the full count
+        if not instances_without_uuid.exists():
             self.stdout.write(
                 f"✓ {model_name}: All instances already have UUIDs"
             )
             return
 
+        total_count = instances_without_uuid.count()
+
         self.stdout.write(
             f"📋 {model_name}: Found {total_count} instances without UUIDs"
         )
@@ -156,46 +153,22 @@ class Command(BaseCommand):
             )
             return
 
-        # Process in batches to avoid memory issues
-        updated_count = 0
         start_time = time.time()
         
-        while True:
-            with transaction.atomic():
-                # Get a batch of instances without UUIDs
-                batch = list(
-                    instances_without_uuid[:self.batch_size]
-                )
-                
-                if not batch:
-                    break
-                
-                # Update each instance in the batch
-                for instance in batch:
-                    try:
-                        # The save method will automatically generate UUID
-                        instance.save(update_fields=['document_owner_uuid'])
-                        updated_count += 1
-                        
-                        if self.verbose_output:
-                            self.stdout.write(
-                                f"   Updated {model_name} ID {instance.pk}: "
-                                f"{instance.document_owner_uuid}"
-                            )
-                            
-                    except Exception as e:
-                        logger.error(
-                            f"Error updating {model_name} ID {instance.pk}: {e}"
-                        )
-                        self.stdout.write(
-                            self.style.ERROR(
-                                f"   ✗ Failed to update ID {instance.pk}: {e}"
-                            )
-                        )
-
-                # Progress update for large datasets
-                if updated_count % (self.batch_size * 10) == 0:
-                    self.stdout.write(f"   Progress: {updated_count}/{total_count}")
+        database = router.db_for_write(model_class)
+        if self._has_server_uuid7(database):
+            # Let PostgreSQL generate the UUIDs in a single UPDATE instead of
+            # sending them from Python batch by batch. The base manager is
+            # used because the default one refuses to update the UUID field.
+            updated_count = model_class._base_manager.using(database).filter(
+                pk__in=instances_without_uuid.values('pk')
+            ).update(
+                document_owner_uuid=Func(function='uuidv7', output_field=UUIDField())
+            )
+        else:
+            updated_count = self._update_in_batches(
+                model_class, instances_without_uuid, model_name, total_count
+            )
 
         elapsed = time.time() - start_time
         self.stdout.write(
@@ -205,15 +178,11 @@ class Command(BaseCommand):
             )
         )
 
-        # Verify the update
-        remaining_count = model_class.objects.filter(
-            document_owner_uuid__isnull=True
-        ).count()
-        
-        if remaining_count > 0:
+        # Verify the update against the initial count rather than recounting
+        if updated_count < total_count:
             self.stdout.write(
                 self.style.WARNING(
-                    f"⚠ {model_name}: {remaining_count} instances still without UUIDs"
+                    f"⚠ {model_name}: {total_count - updated_count} instances still without UUIDs"
                 )
             )
         else:
@@ -221,4 +190,71 @@ class Command(BaseCommand):
                 self.style.SUCCESS(
                     f"✓ {model_name}: All instances now have UUIDs"
                 )
-            )
\ No newline at end of file
+            )
+
+    def _update_in_batches(self, model_class: Type[Model], instances_without_uuid,
+                           model_name: str, total_count: int) -> int:
+        """
+        Assign UUIDs generated in Python, one bulk UPDATE per batch
+        """
+        # Process in batches to avoid memory issues
+        updated_count = 0
+        progress_every = self.batch_size * 10
+        
+        while True:
+            with transaction.atomic():
+                # Get a batch of instances without UUIDs, loading only the
+                # columns that are written back
+                batch = list(
+                    instances_without_uuid.only('pk', 'document_owner_uuid')[:self.batch_size]
+                )
+                
+                if not batch:
+                    break
+                
+                # Generate the batch's UUIDs together, in ascending order, so
+                # the index receives them as one ordered run
+                new_uuids = sorted(_generate_uuid7() for _ in batch)
+                for instance, new_uuid in zip(batch, new_uuids):
+                    instance.document_owner_uuid = new_uuid
+                
+                # One UPDATE per batch instead of one save() per instance.
+                # The default manager strips document_owner_uuid from
+                # bulk_update() to protect existing UUIDs, so go through the
+                # base manager for this backfill.
+                model_class._base_manager.bulk_update(
+                    batch, ['document_owner_uuid'], batch_size=self.batch_size
+                )
+                updated_count += len(batch)
+                
+                if self.verbose_output:
+                    # One write per batch rather than one per instance
+                    self.stdout.write("\n".join(
+                        f"   Updated {model_name} ID {instance.pk}: "
+                        f"{instance.document_owner_uuid}"
+                        for instance in batch
+                    ))
+
+                # Progress update for large datasets
+                if updated_count % progress_every == 0:
+                    self.stdout.write(f"   Progress: {updated_count}/{total_count}")
+
+        return updated_count
+
+    def _has_server_uuid7(self, database: str) -> bool:
+        """
+        Whether the database can generate UUID7 values itself, i.e. it is
+        PostgreSQL with a uuidv7() function (built in from PostgreSQL 18, or
+        user-defined on older versions)
+        """
+        db_connection = connections[database]
+        if db_connection.vendor != 'postgresql':
+            return False
+        try:
+            # Savepoint so a missing function doesn't abort an outer transaction
+            with transaction.atomic(using=database):
+                with db_connection.cursor() as cursor:
+                    cursor.execute("SELECT uuidv7()")
+        except DatabaseError:
+            return False
+        return True
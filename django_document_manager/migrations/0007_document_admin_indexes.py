@@ -0,0 +1,29 @@
+# Generated by Django 5.2.6 on 2026-10-14 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_document_manager', '0006_document_tag_document_idx_document_tag'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='document',
+            index=models.Index(fields=['-date_created'], name='idx_document_created'),
+        ),
+        migrations.AddIndex(
+            model_name='document',
+            index=models.Index(fields=['expiration_date'], name='idx_document_expiration'),
+        ),
+        migrations.AddIndex(
+            model_name='document',
+            index=models.Index(fields=['document_type', '-date_created'], name='idx_document_type_created'),
+        ),
+        migrations.AddIndex(
+            model_name='documentversion',
+            index=models.Index(fields=['-date_created'], name='document_version_created_idx'),
+        ),
+    ]
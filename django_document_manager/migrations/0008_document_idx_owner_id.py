@@ -0,0 +1,17 @@
+# Generated by Django 5.2.6 on 2026-10-14 10:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_document_manager', '0007_document_admin_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='document',
+            index=models.Index(fields=['owner_uuid', 'id'], name='idx_owner_id'),
+        ),
+    ]
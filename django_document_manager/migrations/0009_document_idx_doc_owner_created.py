@@ -0,0 +1,17 @@
+# Generated by Django 5.2.6 on 2026-10-14 11:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_document_manager', '0008_document_idx_owner_id'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='document',
+            index=models.Index(fields=['owner_uuid', '-date_created'], name='idx_doc_owner_created'),
+        ),
+    ]
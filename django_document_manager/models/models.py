@@ -2,17 +2,29 @@ import os
 import logging
 import hashlib
 import mimetypes
-
-from typing import Optional
-
-from django.db import models, transaction
+import mmap
+import sys
+import time
+import uuid
+
+from collections import defaultdict
+from datetime import timedelta
+from functools import lru_cache
+from typing import List, Optional, Tuple, Type
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import IntegrityError, connections, models, router, transaction
+from django.db.models import Exists, OuterRef, QuerySet
+from django.db.models.manager import BaseManager
 from django.apps import apps
 from django.conf import settings
 from django.core.exceptions import ValidationError
+from django.core.files.storage import FileSystemStorage
 from django.urls import reverse
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from django.utils.text import get_valid_filename
+from django.utils.functional import cached_property
 
 from django.contrib.contenttypes.models import ContentType
 
@@ -32,8 +44,99 @@ except (ImportError, ModuleNotFoundError):
     raise ImportError("uuid7 package must be available for uuid7 support.")
 
 
+try:
+    # Optional Rust implementation (pip install uuid-utils). Its compat module
+    # returns stdlib uuid.UUID objects, which UUIDField expects. Like uuid6 it
+    # is monotonic within a process.
+    from uuid_utils.compat import uuid7 as _uuid7
+except ImportError:
+    _uuid7 = uuid6.uuid7
+
+
 def _generate_uuid7():
-    return uuid6.uuid7()
+    return _uuid7()
+
+
+# Read buffer size used when hashing files without hashlib.file_digest
+HASH_BUFFER_SIZE = getattr(settings, 'DOCUMENT_MANAGER_HASH_CHUNK_SIZE', 1024 * 1024)
+
+# Load the system MIME type tables at import rather than on the first upload
+# of each worker. guess_type() only initializes them if nothing has yet, so
+# types other apps registered with mimetypes.add_type() are kept.
+mimetypes.guess_type('document.txt')
+
+# (divisor, unit) pairs for DocumentVersion.get_file_size_display
+_FILE_SIZE_UNITS = [(1, 'B'), (1024, 'KB'), (1024 ** 2, 'MB'), (1024 ** 3, 'GB'), (1024 ** 4, 'TB')]
+
+# Inserts of an auto-numbered version that lose a race for the same number
+# are retried this many times in total
+VERSION_INSERT_ATTEMPTS = 3
+
+def _new_sha256(data=b''):
+    """
+    Return a SHA-256 hasher flagged usedforsecurity=False (Python 3.9+). The
+    hash identifies file contents for integrity and duplicate checks, so FIPS
+    builds can use their plain OpenSSL implementation for it.
+    """
+    if sys.version_info >= (3, 9):
+        return hashlib.sha256(data, usedforsecurity=False)
+    return hashlib.sha256(data)
+
+
+def _sha256_fileobj(fileobj) -> Tuple[str, int]:
+    """
+    Return the SHA-256 hex digest and byte count of a binary file object,
+    read from its current position in a single pass. Uses hashlib.file_digest
+    (Python 3.11+), which runs the read/update loop in C, for readable binary
+    files; anything else with a read() method is read in chunks.
+    """
+    if hasattr(hashlib, 'file_digest'):
+        start = fileobj.tell()
+        try:
+            file_hash = hashlib.file_digest(fileobj, _new_sha256).hexdigest()
+        except ValueError:
+            # Not a readable binary file (no readinto()/readable()); it is
+            # rejected before anything is read
+            pass
+        else:
+            # file_digest hashes BytesIO-like objects through getbuffer() without
+            # moving the position, so the size is measured from the end instead
+            fileobj.seek(0, os.SEEK_END)
+            return file_hash, fileobj.tell() - start
+
+    hasher = _new_sha256()
+    total = 0
+    if not hasattr(fileobj, 'readinto'):
+        while True:
+            chunk = fileobj.read(HASH_BUFFER_SIZE)
+            if not chunk:
+                break
+            hasher.update(chunk)
+            total += len(chunk)
+        return hasher.hexdigest(), total
+
+    buffer = bytearray(HASH_BUFFER_SIZE)
+    view = memoryview(buffer)
+    while True:
+        size = fileobj.readinto(buffer)
+        if not size:
+            break
+        hasher.update(view[:size])
+        total += size
+    return hasher.hexdigest(), total
+
+def _sha256_path(path) -> Tuple[str, int]:
+    """
+    Return the SHA-256 hex digest and size of a local file. The file is
+    memory-mapped and hashed in one call, without a Python read loop.
+    """
+    with open(path, 'rb') as fileobj:
+        size = os.fstat(fileobj.fileno()).st_size
+        if not size:
+            # Empty files can't be memory-mapped
+            return _new_sha256().hexdigest(), 0
+        with mmap.mmap(fileobj.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return _new_sha256(mapped).hexdigest(), size
 
 logger = logging.getLogger(__name__)
 
@@ -69,6 +172,25 @@ class DocumentType(BaseCatalogModel):
         help_text=_("Maximum number of documents of this type per owner. Use 0 for unlimited.")
     )
     
+    @cached_property
+    def allowed_extensions_set(self) -> frozenset:
+        """
+        Allowed extensions without leading dots, lowercased, for O(1) checks
+        """
+        return frozenset(ext.lstrip('.').lower() for ext in self.file_extensions)
+
+    def save(self, *args, **kwargs):
+        """
+        Store file_extensions in one canonical form ('.ext', lowercase,
+        without duplicates), keeping the configured order
+        """
+        if self.file_extensions:
+            self.file_extensions = list(dict.fromkeys(
+                f".{ext.lstrip('.').lower()}" for ext in self.file_extensions
+            ))
+        self.__dict__.pop('allowed_extensions_set', None)
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return f"{self.name} ({self.code})"
     
@@ -109,8 +231,7 @@ def document_upload_to(instance, filename):
         versioned_filename = f"v{instance.version}_{clean_filename}"
     else:
         # Fallback during initial upload before version is assigned
-        import time
-        timestamp = int(time.time() * 1000)  # millisecond precision
+        timestamp = time.time_ns() // 1_000_000  # millisecond precision
         versioned_filename = f"tmp{timestamp}_{clean_filename}"
 
     all_path = f"documents/{owner_path}/{versioned_filename}"
@@ -189,7 +310,8 @@ class DocumentVersion(BaseModel):
             models.Index(fields=['document', 'version'], name='document_version_idx'),
             models.Index(fields=['file_hash'], name='file_hash_idx'),
             models.Index(fields=['document_date'], name='document_date_idx'),
-            models.Index(fields=['document', 'is_current'], name='document_is_current_idx')
+            models.Index(fields=['document', 'is_current'], name='document_is_current_idx'),
+            models.Index(fields=['-date_created'], name='document_version_created_idx'),
         ]
         constraints = [
             models.UniqueConstraint(
@@ -209,18 +331,20 @@ class DocumentVersion(BaseModel):
             )
         ]
 
+    # Fields filled in by save(), excluded from validation before saving
+    AUTO_COMPUTED_FIELDS = ['file_size_bytes', 'file_hash', 'mime_type', 'version']
+
     def get_file_size_display(self):
         """
         Return human-readable file size
         """
-        if self.file_size_bytes < 1024:
-            return f"{self.file_size_bytes} B"
-        elif self.file_size_bytes < 1024 * 1024:
-            return f"{self.file_size_bytes / 1024:.1f} KB"
-        elif self.file_size_bytes < 1024 * 1024 * 1024:
-            return f"{self.file_size_bytes / (1024 * 1024):.1f} MB"
-        else:
-            return f"{self.file_size_bytes / (1024 * 1024 * 1024):.1f} GB"
+        size = self.file_size_bytes
+        # Each unit is 2**10 times the previous one, so the bit length picks it
+        unit_index = min(max(size.bit_length() - 1, 0) // 10, len(_FILE_SIZE_UNITS) - 1)
+        if unit_index == 0:
+            return f"{size} B"
+        divisor, unit = _FILE_SIZE_UNITS[unit_index]
+        return f"{size / divisor:.1f} {unit}"
 
     def clean(self):
         """
@@ -244,14 +368,10 @@ class DocumentVersion(BaseModel):
             # Remove leading dot if present for comparison
             file_extension = file_extension.lstrip('.')
             
-            # Normalize extensions in the allowed list (remove dots, lowercase)
-            allowed_extensions = [
-                ext.lstrip('.').lower() 
-                for ext in document_type.file_extensions
-            ]
-            
-            if file_extension not in allowed_extensions:
-                allowed_ext_str = ', '.join([f'.{ext}' for ext in allowed_extensions])
+            if file_extension not in document_type.allowed_extensions_set:
+                allowed_ext_str = ', '.join(
+                    f".{ext.lstrip('.').lower()}" for ext in document_type.file_extensions
+                )
                 raise ValidationError({
                     'file': ValidationError(
                         _(f"File extension '.{file_extension}' is not allowed for document type '{document_type.name}'. "
@@ -281,49 +401,97 @@ class DocumentVersion(BaseModel):
         # If file was uploaded and we need to compute metadata
         if self.file and not self.file_hash:
             try:
-                # Compute file size
-                self.file_size_bytes = self.file.size
-                
-                # Compute SHA-256 hash
-                self.file_hash = self.compute_file_hash()
-
-                # Detect MIME type
-                mime_type, _ = mimetypes.guess_type(self.file.name)
-                self.mime_type = mime_type or 'application/octet-stream'
+                self._compute_file_metadata()
             except (IOError, OSError) as e:
                 logger.error(f"Error processing file {self.file.name}: {e}")
                 raise ValidationError(f"Error processing file: {e}")
         
-        # Auto-increment version number if not set (with atomic transaction)
-        if not self.version and self.document_id:
-            with transaction.atomic():
-                # Lock the document row to prevent race conditions
-                Document.objects.select_for_update().get(id=self.document_id)
-                
-                # Use a more robust version calculation excluding this instance if it's being updated
-                versions_query = self.document.versions.filter(date_deleted__isnull=True)
-                if self.pk:  # If this instance already exists, exclude it from the calculation
-                    versions_query = versions_query.exclude(pk=self.pk)
-                
-                max_version = versions_query.aggregate(
-                    max_version=models.Max('version')
-                )['max_version'] or 0
-                self.version = max_version + 1
+        # Auto-increment version number if not set
+        auto_version = not self.version and self.document_id
+        if auto_version:
+            self.version = self._next_version_number()
 
         # Run validation (this calls clean())
         # Skip validation if explicitly requested via kwargs
         # This happens AFTER metadata computation and version assignment
         if not kwargs.pop('skip_validation', False):
-            self.full_clean(exclude=['file_size_bytes', 'file_hash', 'mime_type', 'version'])
-
-        # # If this is being set as current, unset other current versions
-        # if self.is_current and self.document.id:
-        #     self.document.versions.exclude(pk=self.pk).update(is_current=False)
+            self._validate_before_save()
 
         if not self.file_original_name and self.file:
             self.file_original_name = self.file.name
 
-        super().save(*args, **kwargs)
+        if not auto_version:
+            super().save(*args, **kwargs)
+            return
+
+        # No lock is taken while computing the version number; the
+        # unique_document_version constraint rejects a concurrent writer that
+        # took the same number, and the insert is retried with a fresh one.
+        # Any other integrity error is raised as is.
+        upload = self.file if self.file and not self.file._committed else None
+        upload_name = upload.name if upload else None
+        for attempt in range(VERSION_INSERT_ATTEMPTS):
+            try:
+                with transaction.atomic():
+                    super().save(*args, **kwargs)
+                return
+            except IntegrityError:
+                if attempt == VERSION_INSERT_ATTEMPTS - 1 or not self._version_taken():
+                    raise
+                if upload is not None:
+                    self._reset_upload(upload, upload_name)
+                self.version = self._next_version_number()
+
+    def _version_taken(self) -> bool:
+        """
+        Whether another live version of this document already has this
+        version number, i.e. whether an insert failed on unique_document_version
+        """
+        return DocumentVersion.objects.filter(
+            document_id=self.document_id,
+            version=self.version,
+            date_deleted__isnull=True,
+        ).exists()
+
+    def _reset_upload(self, upload, upload_name):
+        """
+        Undo FileField.pre_save() after a failed insert: delete the file it
+        stored under the old version number's path and restore the pending
+        upload so the next attempt stores it under the new number.
+        """
+        stored_name = self.file.name
+        if stored_name and stored_name != upload_name:
+            self.file.storage.delete(stored_name)
+        upload.name = upload_name
+        upload._committed = False
+        if hasattr(upload.file, 'seek'):
+            upload.file.seek(0)
+        self.file = upload
+
+    def _validate_before_save(self, exclude=()):
+        """
+        Field validation plus clean(). Uniqueness is not checked here:
+        validate_unique() would cost a SELECT per unique constraint, and the
+        database enforces the same constraints on save.
+        """
+        self.clean_fields(exclude=[*self.AUTO_COMPUTED_FIELDS, *exclude])
+        self.clean()
+
+    def _next_version_number(self) -> int:
+        """
+        Return the next version number for this version's document
+        """
+        versions_query = DocumentVersion.objects.filter(
+            document_id=self.document_id,
+            date_deleted__isnull=True,
+        )
+        if self.pk:  # If this instance already exists, exclude it from the calculation
+            versions_query = versions_query.exclude(pk=self.pk)
+        
+        max_version = versions_query.aggregate(
+            max_version=models.Max('version')
+        )['max_version'] or 0
+        return max_version + 1
 
     def get_download_url(self):
         """
@@ -338,15 +506,59 @@ class DocumentVersion(BaseModel):
         """
         Recompute the file hash (useful if file was modified externally)
         """
+        return self._read_file_digest()[0]
+
+    def _compute_file_metadata(self):
+        """
+        Set file_hash, file_size_bytes and mime_type. Size and hash come from
+        the same read, so remote storages aren't asked for the size separately.
+        """
+        self.file_hash, self.file_size_bytes = self._read_file_digest()
+
+        # Detect MIME type
+        mime_type, _ = mimetypes.guess_type(self.file.name)
+        self.mime_type = mime_type or 'application/octet-stream'
+
+    def _read_file_digest(self) -> Tuple[str, int]:
+        """
+        Return the (SHA-256 hex digest, size in bytes) of the file from a
+        single pass over its contents.
+        """
         if not self.file:
             raise ValueError("No file associated with this version")
         
-        hasher = hashlib.sha256()
-        for chunk in self.file.chunks():
-            hasher.update(chunk)
+        # Digest computed while the upload streamed in (see uploadhandlers)
+        if not self.file._committed:
+            upload_hash = getattr(self.file.file, '_sha256', None)
+            if upload_hash:
+                return upload_hash, self.file.file.size
+        
+        local_path = self._local_file_path()
+        if local_path:
+            return _sha256_path(local_path)
         
-        file_hash = hasher.hexdigest()
-        return file_hash
+        # Reopen/rewind the file and hash the underlying file object directly
+        self.file.open('rb')
+        fileobj = self.file.file
+        fileobj.seek(0)
+        try:
+            return _sha256_fileobj(fileobj)
+        finally:
+            # Leave the file rewound for the storage backend
+            fileobj.seek(0)
+
+    def _local_file_path(self) -> Optional[str]:
+        """
+        Return a local filesystem path for the file contents, if there is one:
+        the stored file on FileSystemStorage, or the temporary file of a large
+        upload that hasn't been stored yet.
+        """
+        if self.file._committed:
+            if isinstance(self.file.storage, FileSystemStorage):
+                return self.file.path
+            return None
+        temporary_file_path = getattr(self.file.file, 'temporary_file_path', None)
+        return temporary_file_path() if temporary_file_path else None
 
     def __str__(self):
         return f"{self.document.title} v{self.version}"
@@ -438,21 +650,21 @@ class DocumentQuerySet(AuditableQuerySet):
             # Chain with other filters
             Document.objects.in_groups([group]).filter(document_type__code='invoice')
         """
-        import uuid as uuid_module
-        from django.db.models import QuerySet
-        from django.db.models.manager import BaseManager
-        
         # Handle QuerySet or Manager (like related manager owner.document_groups)
         if isinstance(groups, (QuerySet, BaseManager)):
-            # Extract group_uuid values from the queryset
-            group_uuids = groups.values_list('group_uuid', flat=True)
-            if not group_uuids:
-                return self.none()
-            return self.filter(groups__group_uuid__in=group_uuids).distinct()
+            group_uuids = groups.values('group_uuid')
+            if group_uuids.query.low_mark or group_uuids.query.high_mark is not None:
+                # Some backends (MySQL) reject LIMIT inside IN subqueries, so
+                # a sliced queryset is evaluated up front instead
+                group_uuids = [row['group_uuid'] for row in group_uuids]
+            # Otherwise the group lookup is embedded as a subquery, so the
+            # documents come back in one query; an empty queryset simply
+            # matches nothing
+            return self._filter_by_group_uuids(group_uuids)
         
         # Handle single DocumentGroup instance
         if isinstance(groups, DocumentGroup):
-            return self.filter(groups__group_uuid=groups.group_uuid).distinct()
+            return self._filter_by_group_uuids([groups.group_uuid])
         
         # Validate input is a list or tuple
         if not isinstance(groups, (list, tuple)):
@@ -465,19 +677,43 @@ class DocumentQuerySet(AuditableQuerySet):
         if not groups:
             return self.none()
         
-        # Validate and normalize to UUIDs
+        # Normalize to UUIDs. Lists of a single type are converted in one
+        # pass; mixed or invalid input goes through the per-item checks
+        group_types = set(map(type, groups))
+        if group_types == {DocumentGroup}:
+            validated_uuids = [group.group_uuid for group in groups]
+        elif group_types == {uuid.UUID}:
+            validated_uuids = list(groups)
+        elif group_types == {str}:
+            try:
+                validated_uuids = list(map(uuid.UUID, groups))
+            except ValueError:
+                # Re-run per item to report which entry is invalid
+                validated_uuids = self._normalize_group_uuids(groups)
+        else:
+            validated_uuids = self._normalize_group_uuids(groups)
+        
+        # Filter documents by groups
+        return self._filter_by_group_uuids(validated_uuids)
+
+    @staticmethod
+    def _normalize_group_uuids(groups):
+        """
+        Validate each group identifier and convert it to a UUID, reporting the
+        index of the first invalid one
+        """
         validated_uuids = []
         for idx, group in enumerate(groups):
             if isinstance(group, DocumentGroup):
                 # DocumentGroup instance
                 validated_uuids.append(group.group_uuid)
-            elif isinstance(group, uuid_module.UUID):
+            elif isinstance(group, uuid.UUID):
                 # Already a UUID object, use it directly
                 validated_uuids.append(group)
             elif isinstance(group, str):
                 # String - attempt to parse as UUID
                 try:
-                    validated_uuids.append(uuid_module.UUID(group))
+                    validated_uuids.append(uuid.UUID(group))
                 except (ValueError, AttributeError) as e:
                     raise ValueError(
                         f"Invalid UUID string at index {idx}: '{group}'. "
@@ -490,9 +726,18 @@ class DocumentQuerySet(AuditableQuerySet):
                     "Each group identifier must be a DocumentGroup instance, "
                     "UUID object, or valid UUID string."
                 )
-        
-        # Filter documents by groups
-        return self.filter(groups__group_uuid__in=validated_uuids).distinct()
+        return validated_uuids
+
+    def _filter_by_group_uuids(self, group_uuids):
+        """
+        Filter to documents in any of the given groups. EXISTS on the M2M
+        table matches each document once, so no DISTINCT over a join is needed.
+        """
+        memberships = self.model.groups.through.objects.filter(
+            document_id=OuterRef('pk'),
+            documentgroup_id__in=group_uuids,
+        )
+        return self.filter(Exists(memberships))
 
 
 class DocumentManager(AuditableManager.from_queryset(DocumentQuerySet)):
@@ -634,35 +879,69 @@ class Document(BaseModel):
         if hasattr(self, cache_attr):
             return getattr(self, cache_attr)
         
+        owner_instance = None
         try:
-            model_class = self.owner_content_type.model_class()
-            if model_class is None:
-                setattr(self, cache_attr, None)
-                return None
-                
-            owner_instance = model_class.objects.get(document_owner_uuid=self.owner_uuid)
-            setattr(self, cache_attr, owner_instance)
-            return owner_instance
-        except (AttributeError, Exception) as e:
-            # Handle any model DoesNotExist or other exceptions
+            # get_for_id() is served from ContentType's shared cache, whereas
+            # dereferencing the FK would query once per Document instance
+            model_class = ContentType.objects.get_for_id(self.owner_content_type_id).model_class()
+        except ContentType.DoesNotExist:
+            logger.warning(f"Content type {self.owner_content_type_id} not found for document owner {self.owner_uuid}")
+            model_class = None
+        
+        if model_class is not None:
             try:
-                if hasattr(e, '__class__') and 'DoesNotExist' in e.__class__.__name__:
-                    logger.warning(f"Owner with UUID {self.owner_uuid} not found for content type {self.owner_content_type}")
-                else:
-                    logger.warning(f"Error resolving owner: {e}")
-            except:
-                pass
-            setattr(self, cache_attr, None)
-            return None
+                owner_instance = model_class.objects.get(document_owner_uuid=self.owner_uuid)
+            except model_class.DoesNotExist:
+                logger.warning(f"Owner with UUID {self.owner_uuid} not found for content type {self.owner_content_type_id}")
+            except model_class.MultipleObjectsReturned:
+                logger.warning(f"Multiple owners with UUID {self.owner_uuid} for content type {self.owner_content_type_id}")
         
+        setattr(self, cache_attr, owner_instance)
+        return owner_instance
+
+    @classmethod
+    def bulk_resolve_owners(cls, documents) -> None:
+        """
+        Resolve the owners of many documents with one query per owner content
+        type and cache them on each document, so the owner property and
+        get_owner_display() don't query per document.
+        """
+        uuids_by_ct = defaultdict(set)
+        for document in documents:
+            uuids_by_ct[document.owner_content_type_id].add(document.owner_uuid)
+
+        owners = {}
+        for ct_id, uuids in uuids_by_ct.items():
+            model_class = ContentType.objects.get_for_id(ct_id).model_class()
+            if model_class is None:
+                continue
+            # document_owner_uuid is only conditionally unique, so in_bulk()
+            # can't key on it; build the mapping directly instead
+            for owner in model_class.objects.filter(document_owner_uuid__in=uuids):
+                owners[(ct_id, owner.document_owner_uuid)] = owner
+
+        for document in documents:
+            document._owner_cache = owners.get((document.owner_content_type_id, document.owner_uuid))
+            document.__dict__.pop('_owner_display_cache', None)
+
+    @classmethod
+    def bulk_owner_displays(cls, documents) -> dict:
+        """
+        Return {document pk: owner display name} for many documents, resolving
+        their owners with bulk_resolve_owners() first.
+        """
+        documents = list(documents)
+        cls.bulk_resolve_owners(documents)
+        return {document.pk: document.get_owner_display() for document in documents}
+
     def set_owner(self, owner_instance: 'BaseDocumentOwnerModel'):
         """Set the owner using both ContentType and UUID"""
         self.owner_content_type = ContentType.objects.get_for_model(owner_instance)
         self.owner_uuid = owner_instance.document_owner_uuid
 
         # Clear cache when owner changes
-        if hasattr(self, '_owner_cache'):
-            delattr(self, '_owner_cache')
+        self.__dict__.pop('_owner_cache', None)
+        self.__dict__.pop('_owner_display_cache', None)
 
     def clean(self):
         """
@@ -706,7 +985,18 @@ class Document(BaseModel):
             # Composite index for owner queries by type
             models.Index(fields=['owner_uuid', 'document_type'], name='idx_owner_type'),
 
+            # Per-owner newest-first listing (get_recent_documents); B-tree
+            # indexes scan backwards, so this also serves ORDER BY -id
+            models.Index(fields=['owner_uuid', 'id'], name='idx_owner_id'),
+            # Per-owner time window queries (get_documents_since)
+            models.Index(fields=['owner_uuid', '-date_created'], name='idx_doc_owner_created'),
+
             models.Index(fields=['tag'], name='idx_document_tag'),
+
+            # Admin changelist ordering, date hierarchy and filters
+            models.Index(fields=['-date_created'], name='idx_document_created'),
+            models.Index(fields=['expiration_date'], name='idx_document_expiration'),
+            models.Index(fields=['document_type', '-date_created'], name='idx_document_type_created'),
         ]
         constraints = [
             models.UniqueConstraint(
@@ -731,15 +1021,15 @@ class Document(BaseModel):
         if version.document_id != self.id:
             raise ValidationError("Version does not belong to this document")
         
-        current = self.get_current_version()
         with transaction.atomic():
-            if current:
-                current.is_current = False
-                current.replaced_by = version
-                current.save(update_fields=['is_current', 'replaced_by'])
-
+            # Retire the previous current version and promote the new one with
+            # one UPDATE each, without loading the previous version first
+            self.versions.filter(is_current=True).exclude(pk=version.pk).update(
+                is_current=False,
+                replaced_by=version,
+            )
+            DocumentVersion.objects.filter(pk=version.pk).update(is_current=True)
             version.is_current = True
-            version.save(update_fields=['is_current'])
 
     def save_new_version(self, file, set_current: bool = True, strict: bool = True, **kwargs) -> 'DocumentVersion':
         """
@@ -758,20 +1048,21 @@ class Document(BaseModel):
                 is_current=False,  # Will set current later if needed
             )
             
-            # Validate only the file-related aspects (extension and size)
+            # Validate the fields and the file's extension and size once, before hashing
             # Don't validate other fields that aren't set yet (hash, size_bytes, mime_type, version)
             try:
-                new_version.clean()  # This only validates file extension and size
+                new_version._validate_before_save()
             except ValidationError as e:
                 # Re-raise with more context
                 logger.warning(f"File validation failed for new version of document {self.pk}: {e}")
                 raise
             
-            # Compute file hash to check for duplicates
-            file_hash = new_version.compute_file_hash()
+            # Compute file metadata once: the hash checks for duplicates, and
+            # save() keeps the values instead of reading the file again
+            new_version._compute_file_metadata()
             existing_version = DocumentVersion.objects.filter(
                 document=self,
-                file_hash=file_hash,
+                file_hash=new_version.file_hash,
             ).first()
 
             if existing_version:
@@ -784,8 +1075,8 @@ class Document(BaseModel):
                 return existing_version
 
             # Save the new version (will auto-compute metadata and version number)
-            # Validation will run during save but will exclude auto-computed fields
-            new_version.save()
+            # Already validated above, so don't validate again during save
+            new_version.save(skip_validation=True)
 
             if set_current:
                 self.set_current_version(new_version)
@@ -793,33 +1084,60 @@ class Document(BaseModel):
             return new_version
 
     @classmethod
-    def create_with_file(cls, owner: 'BaseDocumentOwnerModel', file, document_type: str, title: str, description: str = None, **kwargs) -> 'Document':
+    def _resolve_document_type(cls, document_type) -> 'DocumentType':
         """
-        Create a new document with its first version
+        Return the DocumentType for a code or instance
         """
-        # Validate ownership
-        if not isinstance(owner, BaseDocumentOwnerModel):
-            raise ValidationError("Owner must be an instance of BaseDocumentOwnerModel or its subclass", code='invalid_owner')
-        
-        # Get document type
         if isinstance(document_type, str):
             document_type = DocumentType.get_by_code(document_type)
             if not document_type:
                 raise ValidationError(f"Invalid document type: {document_type}", code='invalid_document_type')
-            
-        # Check max_count_per_owner constraint
-        if document_type.max_count_per_owner > 0:
+        return document_type
+
+    @classmethod
+    def _validate_owner_for_type(cls, owner, document_type: 'DocumentType', owner_counts: dict = None) -> ContentType:
+        """
+        Check that owner is a document owner with room for another document of
+        document_type (max_count_per_owner), and return its ContentType.
+
+        owner_counts, when given, caches the count per (content type id, owner
+        uuid, document type id) and is incremented, so a batch counts its own
+        unsaved documents and queries each owner and type once.
+        """
+        if not isinstance(owner, BaseDocumentOwnerModel):
+            raise ValidationError("Owner must be an instance of BaseDocumentOwnerModel or its subclass", code='invalid_owner')
+
+        owner_content_type = ContentType.objects.get_for_model(owner)
+        if document_type.max_count_per_owner <= 0:
+            return owner_content_type
+
+        key = (owner_content_type.pk, owner.document_owner_uuid, document_type.pk)
+        if owner_counts is not None and key in owner_counts:
+            existing_count = owner_counts[key]
+        else:
             existing_count = cls.objects.filter(
-                owner_content_type=ContentType.objects.get_for_model(owner),
+                owner_content_type=owner_content_type,
                 owner_uuid=owner.document_owner_uuid,
                 document_type=document_type
             ).count()
-            if existing_count >= document_type.max_count_per_owner:
-                raise ValidationError(f"Maximum number of documents of type {document_type} per owner exceeded.", code='max_count_exceeded')
+        if existing_count >= document_type.max_count_per_owner:
+            raise ValidationError(f"Maximum number of documents of type {document_type} per owner exceeded.", code='max_count_exceeded')
+        if owner_counts is not None:
+            owner_counts[key] = existing_count + 1
+        return owner_content_type
+
+    @classmethod
+    def create_with_file(cls, owner: 'BaseDocumentOwnerModel', file, document_type: str, title: str, description: str = None, **kwargs) -> 'Document':
+        """
+        Create a new document with its first version
+        """
+        document_type = cls._resolve_document_type(document_type)
+        # Validate ownership and the max_count_per_owner constraint
+        owner_content_type = cls._validate_owner_for_type(owner, document_type)
         
         # Create document
         document = cls(
-            owner_content_type=ContentType.objects.get_for_model(owner),
+            owner_content_type=owner_content_type,
             owner_uuid=owner.document_owner_uuid,
             document_type=document_type,
             title=title,
@@ -833,24 +1151,129 @@ class Document(BaseModel):
         logger.info(f"Created document {document} with initial version {version}")
         
         return document
+
+    @classmethod
+    def bulk_create_with_files(cls, items, batch_size: int = 500, max_workers: int = 4) -> List['Document']:
+        """
+        Create many documents, each with its first version, in bulk.
+
+        Each item is a dict with the create_with_file arguments ('owner',
+        'file', 'document_type', 'title' and any other Document fields).
+        Every document and version is validated up front (field validation
+        and clean(), as save() would), files are hashed in a thread pool, and
+        then documents and versions are inserted with bulk_create. Nothing is
+        written if any item fails validation.
+
+        Note that bulk_create skips save() and model signals; use
+        create_with_file when those matter.
+        """
+        documents = []
+        versions = []
+        # (content type id, owner uuid, document type id) -> documents counted so far
+        owner_counts = {}
+        # Document types resolved so far, keyed by code or pk, so every item of a
+        # type shares one instance and version validation doesn't refetch it
+        document_types = {}
+
+        for item in items:
+            item = dict(item)
+            owner = item.pop('owner')
+            file = item.pop('file')
+
+            document_type = item.pop('document_type')
+            type_key = document_type if isinstance(document_type, str) else document_type.pk
+            if type_key not in document_types:
+                document_types[type_key] = cls._resolve_document_type(document_type)
+            document_type = document_types[type_key]
+
+            # Check ownership and max_count_per_owner, including documents
+            # earlier in this batch
+            owner_content_type = cls._validate_owner_for_type(owner, document_type, owner_counts)
+
+            document = cls(
+                owner_content_type=owner_content_type,
+                owner_uuid=owner.document_owner_uuid,
+                document_type=document_type,
+                **item
+            )
+            version = DocumentVersion(
+                document=document,
+                file=file,
+                version=1,
+                is_current=True,
+                file_original_name=file.name,
+            )
+            # Same validation save() runs. The foreign keys are excluded: the
+            # related objects are already resolved, and validating them would
+            # query each one again (the document isn't saved yet at all).
+            document.clean_fields(exclude=['document_type', 'owner_content_type'])
+            document.clean()
+            version._validate_before_save(exclude=['document'])
+
+            documents.append(document)
+            versions.append(version)
+
+        if not documents:
+            return []
+
+        # Hashing is I/O bound, so threads overlap the reads
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(versions))) as executor:
+            list(executor.map(DocumentVersion._compute_file_metadata, versions))
+
+        connection = connections[router.db_for_write(cls)]
+        with transaction.atomic(using=connection.alias):
+            if connection.features.can_return_rows_from_bulk_insert:
+                cls.objects.bulk_create(documents, batch_size=batch_size)
+            else:
+                # Versions need the document primary keys, which this backend
+                # doesn't return from a bulk insert
+                for document in documents:
+                    document.save()
+
+            DocumentVersion.objects.bulk_create(versions, batch_size=batch_size)
+
+        logger.info(f"Bulk created {len(documents)} documents with initial versions")
+        return documents
         
     def get_owner_display(self):
         """
-        Return the display name of the document owner
+        Return the display name of the document owner.
+        The result is cached on the instance, since __str__ goes through here.
         """
+        cache_attr = '_owner_display_cache'
+        if cache_attr in self.__dict__:
+            return self.__dict__[cache_attr]
+        
+        display = _("No Owner Found or No Display Method")
         owner_instance = self.owner
         if owner_instance:
             # Try common display methods
             if hasattr(owner_instance, 'get_display_name'):
-                return owner_instance.get_display_name()
+                display = owner_instance.get_display_name()
             elif hasattr(owner_instance, '__str__'):
-                return str(owner_instance)
-        return _("No Owner Found or No Display Method")
+                display = str(owner_instance)
+        
+        self.__dict__[cache_attr] = display
+        return display
+
+    def _prefetched_versions(self) -> Optional[List['DocumentVersion']]:
+        """
+        Return the versions loaded by prefetch_related('versions'), or None if
+        they weren't prefetched. The version helpers below answer from this
+        list instead of querying, so they cost nothing in prefetched list views.
+        """
+        prefetched = getattr(self, '_prefetched_objects_cache', {})
+        if 'versions' in prefetched:
+            return list(prefetched['versions'])
+        return None
 
     def get_latest_version_number(self) -> int:
         """
         Get the latest version number. If no versions exist, return 0.
         """
+        versions = self._prefetched_versions()
+        if versions is not None:
+            return max((version.version for version in versions), default=0)
         latest = self.versions.aggregate(max_version=models.Max('version'))['max_version']
         return latest or 0
     
@@ -858,38 +1281,48 @@ class Document(BaseModel):
         """
         Return the specified version of the document. If it doesn't exist, return None.
         """
+        versions = self._prefetched_versions()
+        if versions is not None:
+            return next((version for version in versions if version.version == n), None)
         return self.versions.filter(version=n).first()
     
     def get_current_version(self) -> Optional['DocumentVersion']:
         """
         Return the current version of the document. If it doesn't exist, return None.
         """
+        versions = self._prefetched_versions()
+        if versions is not None:
+            return next((version for version in versions if version.is_current), None)
         return self.versions.filter(is_current=True).first()
 
     def get_num_versions(self) -> int:
         """
         Return the number of versions of the document.
         """
+        versions = self._prefetched_versions()
+        if versions is not None:
+            return len(versions)
         return self.versions.count()
 
     def get_latest_version(self) -> Optional['DocumentVersion']:
         """
         Return the latest version of the document. If it doesn't exist, return None.
         """
-        return self.get_version(self.get_latest_version_number())
+        versions = self._prefetched_versions()
+        if versions is not None:
+            return max(versions, key=lambda version: version.version, default=None)
+        return self.versions.order_by('-version').first()
 
     @classmethod
     def get_documents_since(cls, owner_uuid, days_ago: int):
         """
         Get documents for an owner created since N days ago.
-        Leverages uuid7's time encoding for efficient queries.
+        Served by the (owner_uuid, -date_created) index.
         """
-        from datetime import datetime, timedelta
-        cutoff_time = datetime.now() - timedelta(days=days_ago)
+        cutoff_time = timezone.now() - timedelta(days=days_ago)
         
-        # UUID7 encodes the timestamp, so we can construct a cutoff UUID
-        # All documents created after cutoff_time will have UUIDs >= to this cutoff
-        # Generate a UUID7 for comparison (we'll compare timestamps instead of UUIDs for simplicity)
+        # Document ids are auto-increment integers, not uuid7, so the time
+        # window is taken from date_created
         return cls.objects.filter(
             owner_uuid=owner_uuid,
             date_created__gte=cutoff_time  # Use date_created timestamp field
@@ -905,6 +1338,19 @@ class Document(BaseModel):
             owner_uuid=owner_uuid
         ).order_by('-id')[:limit]  # uuid7 ordering = time ordering
 
+def _with_owner_uuids(objs) -> list:
+    """
+    Return objs as a list, assigning a generated document_owner_uuid to every
+    object that lacks one. Materialising the list means a generator passed to
+    bulk_create isn't exhausted before the insert.
+    """
+    objs = list(objs)
+    generate = _generate_uuid7
+    for obj in [obj for obj in objs if not obj.document_owner_uuid]:
+        obj.document_owner_uuid = generate()
+    return objs
+
+
 class DocumentOwnerManager(AuditableManager):
     """
     Manager for Document Owner models to facilitate document queries
@@ -922,38 +1368,22 @@ class DocumentOwnerManager(AuditableManager):
             kwargs['document_owner_uuid'] = _generate_uuid7()
         return super().create(**kwargs)
     
-    def get_or_create(self, defaults=None, **kwargs):
-        """
-        Override get_or_create to ensure document_owner_uuid is set on creation
-        """
-        if defaults is None:
-            defaults = {}
-        if 'document_owner_uuid' not in defaults and 'document_owner_uuid' not in kwargs:
-            defaults['document_owner_uuid'] = _generate_uuid7()
-        return super().get_or_create(defaults=defaults, **kwargs)
-    
     def update_or_create(self, defaults=None, **kwargs):
         """
         Override update_or_create to ensure document_owner_uuid is set on creation
         Note: UUIDs are never updated for existing records, only set for new ones
         """
-        if defaults is None:
-            defaults = {}
-        # Ensure UUID is generated for new instances
-        if 'document_owner_uuid' not in defaults and 'document_owner_uuid' not in kwargs:
-            defaults['document_owner_uuid'] = _generate_uuid7()
-        # Remove document_owner_uuid from defaults if it's None (prevent overwriting existing UUIDs)
-        if 'document_owner_uuid' in defaults and defaults['document_owner_uuid'] is None:
-            del defaults['document_owner_uuid']
+        # New rows get their UUID from save(); generating one into defaults
+        # would also overwrite the UUID of an existing row on update
+        if defaults and 'document_owner_uuid' in defaults and defaults['document_owner_uuid'] is None:
+            defaults = {k: v for k, v in defaults.items() if k != 'document_owner_uuid'}
         return super().update_or_create(defaults=defaults, **kwargs)
     
     def bulk_create(self, objs, **kwargs):
         """
         Override bulk_create to ensure document_owner_uuid is set for all objects
         """
-        for obj in objs:
-            if not obj.document_owner_uuid:
-                obj.document_owner_uuid = _generate_uuid7()
+        objs = _with_owner_uuids(objs)
         return super().bulk_create(objs, **kwargs)
     
     def bulk_update(self, objs, fields, **kwargs):
@@ -973,13 +1403,26 @@ class DocumentOwnerQuerySet(AuditableQuerySet):
         """
         Filter owners that have at least one document
         """
-        from .models import Document
-        
-        owner_uuids = Document.objects.values_list('owner_uuid', flat=True).distinct()
         return self.filter(
-            document_owner_uuid__in=owner_uuids,
+            Exists(self._owner_documents()),
             document_owner_uuid__isnull=False
         )
+
+    def annotate_has_documents(self):
+        """
+        Annotate each owner with a boolean `has_documents`, for callers that
+        need the flag per owner rather than a filtered queryset
+        """
+        return self.annotate(has_documents=Exists(self._owner_documents()))
+
+    @staticmethod
+    def _owner_documents():
+        """
+        Documents of the outer query's owner, for use in Exists(). A
+        correlated EXISTS lets the database semi-join on the owner index
+        instead of building a DISTINCT list of every document's owner.
+        """
+        return Document.objects.filter(owner_uuid=OuterRef('document_owner_uuid'))
     
     def update(self, **kwargs):
         """
@@ -1000,33 +1443,17 @@ class DocumentOwnerQuerySet(AuditableQuerySet):
         """
         Override update_or_create to ensure document_owner_uuid is set on creation
         """
-        if defaults is None:
-            defaults = {}
-        # Ensure UUID is generated for new instances
-        if 'document_owner_uuid' not in defaults and 'document_owner_uuid' not in kwargs:
-            defaults['document_owner_uuid'] = _generate_uuid7()
-        # Remove document_owner_uuid from defaults if it's None
-        if 'document_owner_uuid' in defaults and defaults['document_owner_uuid'] is None:
-            del defaults['document_owner_uuid']
+        # New rows get their UUID from save(); generating one into defaults
+        # would also overwrite the UUID of an existing row on update
+        if defaults and 'document_owner_uuid' in defaults and defaults['document_owner_uuid'] is None:
+            defaults = {k: v for k, v in defaults.items() if k != 'document_owner_uuid'}
         return super().update_or_create(defaults=defaults, **kwargs)
     
-    def get_or_create(self, defaults=None, **kwargs):
-        """
-        Override get_or_create to ensure document_owner_uuid is set on creation
-        """
-        if defaults is None:
-            defaults = {}
-        if 'document_owner_uuid' not in defaults and 'document_owner_uuid' not in kwargs:
-            defaults['document_owner_uuid'] = _generate_uuid7()
-        return super().get_or_create(defaults=defaults, **kwargs)
-    
     def bulk_create(self, objs, **kwargs):
         """
         Override bulk_create to ensure document_owner_uuid is set
         """
-        for obj in objs:
-            if not obj.document_owner_uuid:
-                obj.document_owner_uuid = _generate_uuid7()
+        objs = _with_owner_uuids(objs)
         return super().bulk_create(objs, **kwargs)
 
 class BaseDocumentOwnerModel(BaseModel):
@@ -1082,39 +1509,12 @@ class BaseDocumentOwnerModel(BaseModel):
         Generate document_owner_uuid if it doesn't exist.
         This handles both new instances and existing instances that don't have UUIDs yet.
         """
+        # Both uuid7 backends are monotonic within a process (uuid6 bumps the
+        # millisecond, uuid_utils keeps a counter), and across processes a
+        # collision needs the same millisecond and matching random bits, so a
+        # single INSERT is done and u_doc_*_uuid covers the remaining tail.
         if not self.document_owner_uuid:
-            # Generate UUID7 for new instances or existing instances without UUIDs
             self.document_owner_uuid = _generate_uuid7()
-            
-            # For extra safety, ensure uniqueness in case of race conditions
-            max_attempts = 10
-            attempt = 0
-            
-            while attempt < max_attempts:
-                try:
-                    # Check if this UUID already exists for this model
-                    if self.__class__.objects.filter(
-                        document_owner_uuid=self.document_owner_uuid
-                    ).exclude(pk=self.pk).exists():
-                        # Generate a new UUID and try again
-                        self.document_owner_uuid = _generate_uuid7()
-                        attempt += 1
-                        continue
-                    else:
-                        # UUID is unique, break out of loop
-                        break
-                except Exception as e:
-                    logger.warning(f"Error checking UUID uniqueness: {e}")
-                    # Generate new UUID and try again
-                    self.document_owner_uuid = _generate_uuid7()
-                    attempt += 1
-            
-            if attempt >= max_attempts:
-                logger.error(f"Could not generate unique document_owner_uuid after {max_attempts} attempts")
-                raise ValidationError(
-                    _("Unable to generate unique document owner UUID. Please try again.")
-                )
-        
         super().save(*args, **kwargs)
 
     def get_display_name(self):
@@ -1156,6 +1556,22 @@ class BaseDocumentOwnerModel(BaseModel):
             owner_uuid=self.document_owner_uuid
         )
     
+    def iter_documents(self, chunk_size=1000):
+        """
+        Iterate over the documents owned by this entity without caching them.
+        
+        Rows are fetched chunk_size at a time (a server-side cursor on
+        PostgreSQL), so memory stays bounded for owners with very many
+        documents.
+        
+        Args:
+            chunk_size (int): Number of rows fetched from the database at a time
+            
+        Returns:
+            Iterator: Document instances
+        """
+        return self.get_documents().iterator(chunk_size=chunk_size)
+    
     def get_documents_by_type(self, document_type_code):
         """
         Get documents of a specific type owned by this entity.
@@ -1204,12 +1620,33 @@ class BaseDocumentOwnerModel(BaseModel):
         Returns:
             QuerySet: Owner instances that have documents
         """
-        # Import here to avoid circular dependency issues
-        from .models import Document
-        
-        owner_uuids = Document.objects.values_list('owner_uuid', flat=True).distinct()
         # Filter out None UUIDs and ensure our instances have UUIDs too
         return cls.objects.filter(
-            document_owner_uuid__in=owner_uuids,
+            Exists(DocumentOwnerQuerySet._owner_documents()),
             document_owner_uuid__isnull=False
-        )
\ No newline at end of file
+        )
+
+
+@lru_cache(maxsize=1)
+def get_document_owner_models() -> Tuple[Type[BaseDocumentOwnerModel], ...]:
+    """
+    Return the concrete BaseDocumentOwnerModel subclasses registered with the
+    app registry, ordered by label. Walks __subclasses__ instead of checking
+    every model in the project; call it once the app registry is ready.
+    """
+    subclasses = set()
+    stack = list(BaseDocumentOwnerModel.__subclasses__())
+    while stack:
+        model = stack.pop()
+        if model not in subclasses:
+            subclasses.add(model)
+            stack.extend(model.__subclasses__())
+
+    return tuple(sorted(
+        (
+            model for model in subclasses
+            if not model._meta.abstract
+            and apps.all_models.get(model._meta.app_label, {}).get(model._meta.model_name) is model
+        ),
+        key=lambda model: model._meta.label_lower,
+    ))
@@ -0,0 +1,56 @@
+"""
+Upload handlers that compute the SHA-256 of uploaded files while they stream in.
+
+DocumentVersion reuses the digest instead of reading the file a second time.
+Enable them in place of Django's default handlers:
+
+    FILE_UPLOAD_HANDLERS = [
+        'django_document_manager.uploadhandlers.HashingMemoryFileUploadHandler',
+        'django_document_manager.uploadhandlers.HashingTemporaryFileUploadHandler',
+    ]
+"""
+
+from django.core.files.uploadhandler import (
+    MemoryFileUploadHandler,
+    TemporaryFileUploadHandler,
+)
+
+from .models.models import _new_sha256
+
+
+class HashingUploadHandlerMixin:
+    """
+    Feed every chunk this handler keeps into a SHA-256 hasher and attach the
+    hex digest to the uploaded file as `_sha256`
+    """
+
+    def new_file(self, *args, **kwargs):
+        # Set before super(): MemoryFileUploadHandler raises StopFutureHandlers
+        # from new_file() when it takes the file
+        self._hasher = _new_sha256()
+        super().new_file(*args, **kwargs)
+
+    def receive_data_chunk(self, raw_data, start):
+        remaining = super().receive_data_chunk(raw_data, start)
+        if remaining is None:
+            # The chunk was consumed by this handler, not passed on
+            self._hasher.update(raw_data)
+        return remaining
+
+    def file_complete(self, file_size):
+        uploaded_file = super().file_complete(file_size)
+        if uploaded_file is not None:
+            uploaded_file._sha256 = self._hasher.hexdigest()
+        return uploaded_file
+
+
+class HashingMemoryFileUploadHandler(HashingUploadHandlerMixin, MemoryFileUploadHandler):
+    """
+    MemoryFileUploadHandler that hashes uploads as they are received
+    """
+
+
+class HashingTemporaryFileUploadHandler(HashingUploadHandlerMixin, TemporaryFileUploadHandler):
+    """
+    TemporaryFileUploadHandler that hashes uploads as they are received
+    """
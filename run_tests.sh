@@ -68,6 +68,21 @@ else
 fi
 echo ""
 
+echo "=========================================="
+echo "Test Suite: File Hashing"
+echo "=========================================="
+echo ""
+
+# Run file hashing tests with PYTHONPATH set
+if PYTHONPATH=. python test_app/tests/test_file_hashing.py; then
+    echo -e "${GREEN}✓ File hashing tests PASSED${NC}"
+    ((PASSED_TESTS++))
+else
+    echo -e "${RED}✗ File hashing tests FAILED${NC}"
+    ((FAILED_TESTS++))
+fi
+echo ""
+
 # Summary
 echo "=========================================="
 echo "Test Summary"
@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+"""
+Tests for file hashing: the SHA-256/size helper used by DocumentVersion and
+the hashing upload handlers.
+
+Usage:
+    python manage.py test test_app.tests.test_file_hashing
+    python test_app/tests/test_file_hashing.py
+"""
+import hashlib
+import io
+import os
+import sys
+
+import django
+
+# Under manage.py test and pytest-django Django is already set up before this
+# module is imported; only a direct script run has to do it
+if __name__ == '__main__':
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core_build.settings')
+    django.setup()
+
+from django.core.files.base import ContentFile, File
+from django.core.files.uploadedfile import (
+    InMemoryUploadedFile, SimpleUploadedFile, TemporaryUploadedFile,
+)
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from django_document_manager.models import DocumentVersion
+from django_document_manager.models.models import _sha256_fileobj
+
+PAYLOAD = b'document manager hashing payload\n' * 1000
+PAYLOAD_SHA256 = hashlib.sha256(PAYLOAD).hexdigest()
+
+HASHING_UPLOAD_HANDLERS = [
+    'django_document_manager.uploadhandlers.HashingMemoryFileUploadHandler',
+    'django_document_manager.uploadhandlers.HashingTemporaryFileUploadHandler',
+]
+
+
+class ReadOnlyFile:
+    """Storage-style file object with read() and seek() but no readinto()"""
+
+    def __init__(self, data):
+        self._buffer = io.BytesIO(data)
+
+    def read(self, size=-1):
+        return self._buffer.read(size)
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        return self._buffer.seek(offset, whence)
+
+    def tell(self):
+        return self._buffer.tell()
+
+
+class Sha256FileobjTestCase(SimpleTestCase):
+    """_sha256_fileobj returns the digest and byte count of any binary file object"""
+
+    def test_file_objects(self):
+        file_objects = {
+            'BytesIO': io.BytesIO(PAYLOAD),
+            'ContentFile': ContentFile(PAYLOAD, name='payload.txt'),
+            'SimpleUploadedFile': SimpleUploadedFile('payload.txt', PAYLOAD),
+            'read() only': ReadOnlyFile(PAYLOAD),
+            'File wrapping read() only': File(ReadOnlyFile(PAYLOAD), name='payload.txt'),
+        }
+        for label, fileobj in file_objects.items():
+            with self.subTest(file=label):
+                self.assertEqual(_sha256_fileobj(fileobj), (PAYLOAD_SHA256, len(PAYLOAD)))
+
+    def test_empty_file(self):
+        self.assertEqual(
+            _sha256_fileobj(io.BytesIO()),
+            (hashlib.sha256(b'').hexdigest(), 0),
+        )
+
+
+@override_settings(FILE_UPLOAD_HANDLERS=HASHING_UPLOAD_HANDLERS)
+class HashingUploadHandlersTestCase(SimpleTestCase):
+    """
+    The hashing upload handlers attach the SHA-256 of the body to the uploaded
+    file, whichever of them ends up keeping it
+    """
+
+    def upload(self, payload):
+        """Parse a multipart POST of payload and return the uploaded file"""
+        request = RequestFactory().post('/upload/', {
+            'file': SimpleUploadedFile('upload.pdf', payload),
+        })
+        uploaded_file = request.FILES['file']
+        self.addCleanup(uploaded_file.close)
+        return uploaded_file
+
+    def test_small_upload_kept_in_memory(self):
+        uploaded_file = self.upload(PAYLOAD)
+        self.assertIsInstance(uploaded_file, InMemoryUploadedFile)
+        self.assertEqual(uploaded_file._sha256, PAYLOAD_SHA256)
+
+    def test_large_upload_handed_on_to_temporary_file(self):
+        # Larger than the memory limit and split over several chunks, so the
+        # memory handler passes every chunk on to the temporary file handler
+        payload = PAYLOAD * 8
+        with self.settings(FILE_UPLOAD_MAX_MEMORY_SIZE=len(PAYLOAD)):
+            uploaded_file = self.upload(payload)
+        self.assertIsInstance(uploaded_file, TemporaryUploadedFile)
+        self.assertEqual(uploaded_file._sha256, hashlib.sha256(payload).hexdigest())
+
+    def test_document_version_reuses_upload_digest(self):
+        uploaded_file = self.upload(PAYLOAD)
+        # A digest that doesn't match the contents shows the file isn't read again
+        uploaded_file._sha256 = 'f' * 64
+        version = DocumentVersion(file=uploaded_file)
+        self.assertEqual(version._read_file_digest(), ('f' * 64, len(PAYLOAD)))
+
+
+if __name__ == '__main__':
+    from django.conf import settings
+    from django.test.utils import get_runner
+
+    TestRunner = get_runner(settings)
+    failures = TestRunner(verbosity=2).run_tests(['test_app.tests.test_file_hashing'])
+    sys.exit(1 if failures else 0)
@@ -7,6 +7,9 @@ Tests for:
 3. Validation timing fixes
 """
 
+import hashlib
+from functools import lru_cache
+
 from django.test import TestCase
 from django.core.files.base import ContentFile
 from django.core.exceptions import ValidationError
@@ -18,21 +21,44 @@ from django_document_manager.models import (
 from test_app.models import TestCompany, TestPerson
 
 
+@lru_cache(maxsize=None)
+def _file_payload(size_mb):
+    """File body of the given size; bytes are immutable, so one per size is shared"""
+    return b'X' * int(size_mb * 1024 * 1024)
+
+
+@lru_cache(maxsize=None)
+def _file_payload_sha256(size_mb):
+    """SHA-256 of _file_payload(size_mb), computed once per size"""
+    return hashlib.sha256(_file_payload(size_mb)).hexdigest()
+
+
+def _test_file(filename, size_mb):
+    """
+    ContentFile carrying its precomputed digest, the way the hashing upload
+    handlers hand files over, so DocumentVersion doesn't hash it again
+    """
+    content_file = ContentFile(_file_payload(size_mb), name=filename)
+    content_file._sha256 = _file_payload_sha256(size_mb)
+    return content_file
+
+
 class FileValidationErrorCodesTestCase(TestCase):
     """Test error codes for file validation"""
     
-    def setUp(self):
+    @classmethod
+    def setUpTestData(cls):
         """Create test owner and document types"""
-        self.owner = TestCompany.objects.create(name='Test Company')
+        cls.owner = TestCompany.objects.create(name='Test Company')
         
-        self.pdf_only_type = DocumentType.objects.create(
+        cls.pdf_only_type = DocumentType.objects.create(
             code='test_pdf_only',
             name='PDF Only Type',
             file_extensions=['.pdf'],
             max_file_size_mb=10
         )
         
-        self.small_file_type = DocumentType.objects.create(
+        cls.small_file_type = DocumentType.objects.create(
             code='test_small',
             name='Small File Type',
             file_extensions=['.pdf', '.txt'],
@@ -41,8 +67,7 @@ class FileValidationErrorCodesTestCase(TestCase):
         
     def create_test_file(self, filename, size_mb=1):
         """Create a test file with specified size"""
-        content = b'X' * int(size_mb * 1024 * 1024)
-        return ContentFile(content, name=filename)
+        return _test_file(filename, size_mb)
         
     def test_invalid_extension_error_code(self):
         """Test that invalid file extension raises error with code 'invalid_extension'"""
@@ -129,15 +154,15 @@ class FileValidationErrorCodesTestCase(TestCase):
 class MaxCountPerOwnerTestCase(TestCase):
     """Test max_count_per_owner constraint"""
     
-    def setUp(self):
+    @classmethod
+    def setUpTestData(cls):
         """Create test owners"""
-        self.owner1 = TestCompany.objects.create(name='Company 1')
-        self.owner2 = TestCompany.objects.create(name='Company 2')
+        cls.owner1 = TestCompany.objects.create(name='Company 1')
+        cls.owner2 = TestCompany.objects.create(name='Company 2')
         
     def create_test_file(self, filename, size_mb=1):
         """Create a test file"""
-        content = b'X' * int(size_mb * 1024 * 1024)
-        return ContentFile(content, name=filename)
+        return _test_file(filename, size_mb)
         
     def test_unlimited_documents(self):
         """Test that max_count_per_owner=0 allows unlimited documents"""
@@ -149,15 +174,16 @@ class MaxCountPerOwnerTestCase(TestCase):
             max_count_per_owner=0  # Unlimited
         )
         
-        # Create 5 documents
-        for i in range(5):
-            test_file = self.create_test_file(f'test_{i}.pdf', size_mb=1)
-            Document.create_with_file(
-                owner=self.owner1,
-                file=test_file,
-                document_type=doc_type,
-                title=f'Unlimited Test {i}'
-            )
+        # Create 5 documents in one bulk insert
+        Document.bulk_create_with_files([
+            {
+                'owner': self.owner1,
+                'file': self.create_test_file(f'test_{i}.pdf', size_mb=1),
+                'document_type': doc_type,
+                'title': f'Unlimited Test {i}',
+            }
+            for i in range(5)
+        ])
         
         # Verify all were created
         doc_count = Document.objects.filter(
@@ -212,24 +238,25 @@ class MaxCountPerOwnerTestCase(TestCase):
             max_count_per_owner=2
         )
         
-        # Owner 1: Create 2 documents
-        for i in range(2):
-            test_file = self.create_test_file(f'owner1_test_{i}.pdf', size_mb=1)
-            Document.create_with_file(
-                owner=self.owner1,
-                file=test_file,
-                document_type=doc_type,
-                title=f'Owner1 Test {i}'
-            )
-        
-        # Owner 2: Should still be able to create 2 documents
-        for i in range(2):
-            test_file = self.create_test_file(f'owner2_test_{i}.pdf', size_mb=1)
+        # Seed the first document of each owner in bulk; the second one, which
+        # reaches the limit, goes through create_with_file's count check
+        Document.bulk_create_with_files([
+            {
+                'owner': owner,
+                'file': self.create_test_file(f'{prefix}_test_0.pdf', size_mb=1),
+                'document_type': doc_type,
+                'title': f'{prefix.capitalize()} Test 0',
+            }
+            for owner, prefix in ((self.owner1, 'owner1'), (self.owner2, 'owner2'))
+        ])
+        
+        # Owner 1 reaches its limit; owner 2 should still be able to as well
+        for owner, prefix in ((self.owner1, 'owner1'), (self.owner2, 'owner2')):
             Document.create_with_file(
-                owner=self.owner2,
-                file=test_file,
+                owner=owner,
+                file=self.create_test_file(f'{prefix}_test_1.pdf', size_mb=1),
                 document_type=doc_type,
-                title=f'Owner2 Test {i}'
+                title=f'{prefix.capitalize()} Test 1'
             )
         
         # Verify counts
@@ -249,10 +276,11 @@ class MaxCountPerOwnerTestCase(TestCase):
 class ValidationTimingTestCase(TestCase):
     """Test that validation happens at the correct time"""
     
-    def setUp(self):
+    @classmethod
+    def setUpTestData(cls):
         """Create test owner and document type"""
-        self.owner = TestCompany.objects.create(name='Timing Test Company')
-        self.doc_type = DocumentType.objects.create(
+        cls.owner = TestCompany.objects.create(name='Timing Test Company')
+        cls.doc_type = DocumentType.objects.create(
             code='test_timing',
             name='Timing Test Type',
             file_extensions=['.pdf'],
@@ -261,8 +289,7 @@ class ValidationTimingTestCase(TestCase):
         
     def create_test_file(self, filename, size_mb=1):
         """Create a test file"""
-        content = b'X' * int(size_mb * 1024 * 1024)
-        return ContentFile(content, name=filename)
+        return _test_file(filename, size_mb)
         
     def test_metadata_computed_before_validation(self):
         """Test that validation happens after metadata computation"""
@@ -279,12 +306,27 @@ class ValidationTimingTestCase(TestCase):
         # Verify that metadata was computed
         version = document.get_current_version()
         self.assertIsNotNone(version)
-        self.assertIsNotNone(version.file_size_bytes)
-        self.assertIsNotNone(version.file_hash)
+        self.assertEqual(version.file_size_bytes, len(_file_payload(2)))
+        self.assertEqual(version.file_hash, _file_payload_sha256(2))
         self.assertIsNotNone(version.mime_type)
         self.assertIsNotNone(version.version)
         self.assertGreater(version.version, 0)
         
+    def test_metadata_computed_from_file_contents(self):
+        """Test hash and size of a plain ContentFile, read by DocumentVersion itself"""
+        # No precomputed digest attached, unlike the files from _test_file()
+        payload = _file_payload(1)
+        document = Document.create_with_file(
+            owner=self.owner,
+            file=ContentFile(payload, name='plain.pdf'),
+            document_type=self.doc_type,
+            title='Plain ContentFile'
+        )
+        
+        version = document.get_current_version()
+        self.assertEqual(version.file_hash, hashlib.sha256(payload).hexdigest())
+        self.assertEqual(version.file_size_bytes, len(payload))
+        
     def test_valid_files_pass_validation(self):
         """Test that valid files pass all validations"""
         doc_type = DocumentType.objects.create(
@@ -311,3 +353,29 @@ class ValidationTimingTestCase(TestCase):
                 title=f'Valid {filename}'
             )
             self.assertIsNotNone(document.pk)
+
+    def test_bulk_create_validates_fields(self):
+        """Test that bulk_create_with_files runs field validation before writing"""
+        items = [
+            {
+                'owner': self.owner,
+                'file': self.create_test_file('valid.pdf'),
+                'document_type': self.doc_type,
+                'title': 'Valid bulk document',
+            },
+            {
+                'owner': self.owner,
+                'file': self.create_test_file('invalid.pdf'),
+                'document_type': self.doc_type,
+                'title': 'T' * 201,  # over max_length
+                'access_level': 'everyone',  # not a valid choice
+            },
+        ]
+        
+        with self.assertRaises(ValidationError) as cm:
+            Document.bulk_create_with_files(items)
+        
+        self.assertIn('title', cm.exception.message_dict)
+        self.assertIn('access_level', cm.exception.message_dict)
+        # Nothing is written, not even the valid item
+        self.assertFalse(Document.objects.filter(document_type=self.doc_type).exists())
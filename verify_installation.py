@@ -2,68 +2,74 @@
 """
 Installation verification script for Django Document Manager
 Run this script to verify all dependencies are properly installed
+
+Usage:
+    python verify_installation.py          # fast check, imports nothing
+    python verify_installation.py --deep   # also import the models
+    python verify_installation.py --configure  # also boot Django with the apps
 """
 
+import importlib.util
 import sys
 
-def test_imports():
-    """Test that all required imports work"""
+try:
+    from importlib.metadata import distributions
+except ImportError:  # Python < 3.8
+    distributions = None
+
+# (module, distribution name, install hint) for every required package. The
+# checks use find_spec() and the installed metadata, so no package code runs
+# unless --deep is passed.
+REQUIRED_PACKAGES = [
+    ('django', 'Django', None),
+    ('uuid6', 'uuid6', None),
+    ('django_crud_audit', 'django-crud-audit',
+     'pip install git+https://github.com/LorenzoSilvaMoore/django-crud-audit.git@main'),
+    ('django_catalogs', 'django-catalogs',
+     'pip install git+https://github.com/LorenzoSilvaMoore/django-catalogs.git@main'),
+    ('django_document_manager', 'django-document-manager', None),
+]
+
+
+def _installed_versions():
+    """Map of normalized distribution name to version, from one metadata scan"""
+    if distributions is None:
+        return {}
+    return {
+        (dist.metadata['Name'] or '').lower().replace('_', '-'): dist.version
+        for dist in distributions()
+    }
+
+
+def test_imports(deep=False):
+    """Test that all required packages are installed"""
     
     print("🔍 Testing Django Document Manager installation...\n")
     
-    # Test core Django
-    try:
-        import django
-        print(f"✅ Django {django.get_version()}")
-    except ImportError as e:
-        print(f"❌ Django import failed: {e}")
-        return False
+    installed = _installed_versions()
     
-    # Test uuid6
-    try:
-        import uuid6
-        print(f"✅ uuid6 {uuid6.__version__}")
-    except ImportError as e:
-        print(f"❌ uuid6 import failed: {e}")
-        return False
+    for module, distribution, install_hint in REQUIRED_PACKAGES:
+        if importlib.util.find_spec(module) is None:
+            print(f"❌ {distribution} is not installed")
+            if install_hint:
+                print(f"   Install: {install_hint}")
+            return False
+        print(f"✅ {distribution} {installed.get(distribution.lower(), '')}".rstrip())
     
-    # Test private dependencies
-    try:
-        from django_crud_audit.models import BaseModel
-        print("✅ django-crud-audit")
-    except ImportError as e:
-        print(f"❌ django-crud-audit import failed: {e}")
-        print("   Install: pip install git+https://github.com/LorenzoSilvaMoore/django-crud-audit.git@main")
-        return False
-    
-    try:
-        from django_catalogs.models import BaseCatalogModel
-        print("✅ django-catalogs")
-    except ImportError as e:
-        print(f"❌ django-catalogs import failed: {e}")
-        print("   Install: pip install git+https://github.com/LorenzoSilvaMoore/django-catalogs.git@main")
-        return False
-    
-    # Test main package
-    try:
-        import django_document_manager
-        print(f"✅ django-document-manager {django_document_manager.__version__}")
-    except ImportError as e:
-        print(f"❌ django-document-manager import failed: {e}")
-        return False
-    
-    # Test main models
-    try:
-        from django_document_manager.models import (
-            Document, 
-            DocumentType, 
-            DocumentVersion, 
-            BaseDocumentOwnerModel
-        )
-        print("✅ All django-document-manager models")
-    except ImportError as e:
-        print(f"❌ Model imports failed: {e}")
-        return False
+    # Importing the models runs Django and the dependencies' module code, so
+    # it's only done on request
+    if deep:
+        try:
+            from django_document_manager.models import (
+                Document, 
+                DocumentType, 
+                DocumentVersion, 
+                BaseDocumentOwnerModel
+            )
+            print("✅ All django-document-manager models")
+        except ImportError as e:
+            print(f"❌ Model imports failed: {e}")
+            return False
     
     print("\n🎉 All dependencies installed successfully!")
     print("\n📋 Next steps:")
@@ -121,9 +127,12 @@ if __name__ == '__main__':
     print("Django Document Manager Installation Verification")
     print("=" * 60)
     
-    success = test_imports()
+    args = sys.argv[1:]
+    success = test_imports(deep='--deep' in args)
     if success:
-        test_django_settings()
+        # Booting Django is by far the slowest step, so it's opt-in as well
+        if '--configure' in args:
+            test_django_settings()
         print("\n✨ Installation verification complete!")
         sys.exit(0)
     else: